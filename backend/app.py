@@ -1,5 +1,7 @@
 from subtitle_converter import convert_vtt_to_srt, extract_clean_text_from_srt
-from flask import Flask, request, jsonify
+from chunk_dedup import group_near_duplicates, get_dedup_stats, remove_repeated_segments
+from quality_tiers import QUALITY_TIERS, select_tier, estimate_duration_from_text, measure_load
+from flask import Flask, request, jsonify, Response
 from deep_translator import GoogleTranslator
 import os
 import yt_dlp as youtube_dl
@@ -16,6 +18,10 @@ import time
 import threading
 import psutil
 import traceback
+import json
+import copy
+import queue
+from concurrent.futures import ThreadPoolExecutor
 
 # Initialize Flask app
 app = Flask(__name__)
@@ -26,7 +32,10 @@ TEMP_DIR = tempfile.mkdtemp(prefix="video_processor_")
 print(f"Created temporary directory: {TEMP_DIR}")
 
 # Load Whisper model for transcription
-whisper_model = whisper.load_model("base")
+# Other sizes are loaded on first use by the quality tier that needs them
+whisper_models = {"base": whisper.load_model("base")}
+whisper_models_lock = threading.Lock()
+whisper_model_load_locks = {}
 
 # Load BART model for summarization
 print("Loading BART summarization model... (This may take time)")
@@ -35,6 +44,14 @@ print(f"Device set to use {device}")
 summarizer = pipeline("summarization", model="facebook/bart-large-cnn", device=0 if device == "cuda" else -1)
 print("Model loaded successfully!")
 
+# Batch processing limits
+BATCH_MAX_ITEMS = int(os.environ.get("BATCH_MAX_ITEMS", 50))
+BATCH_MAX_WORKERS = int(os.environ.get("BATCH_MAX_WORKERS", 2))
+BATCH_TASKS = ("subtitle", "transcription", "summary")
+
+# One worker pool shared by all batches, so concurrent batches don't multiply the pipelines
+batch_executor = ThreadPoolExecutor(max_workers=BATCH_MAX_WORKERS)
+
 # Simple in-memory queue system
 processing_queue = []
 queue_lock = threading.Lock()
@@ -51,14 +68,14 @@ def cleanup_temp_directory():
         print(f"Deleted temporary directory: {TEMP_DIR}")
 
 # --- Queue Management Functions ---
-def add_to_queue(job_id, job_type, data):
+def add_to_queue(job_id, job_type, data, status="queued"):
     with queue_lock:
         queue_position = len(processing_queue)
         processing_queue.append({
             "id": job_id,
             "type": job_type,
             "data": data,
-            "status": "queued",
+            "status": status,
             "submitted_at": time.time()
         })
         return queue_position
@@ -70,6 +87,22 @@ def get_queue_position(job_id):
                 return i
         return -1  # Not found
 
+def remove_from_queue(job_id):
+    with queue_lock:
+        processing_queue[:] = [job for job in processing_queue if job["id"] != job_id]
+
+def get_queue_load(exclude_job_id=None):
+    # Number of jobs and total estimated cost (seconds of audio) currently running
+    with queue_lock:
+        return measure_load(processing_queue, exclude_job_id)
+
+def update_queue_job(job_id, status, **data):
+    with queue_lock:
+        for job in processing_queue:
+            if job["id"] == job_id:
+                job["status"] = status
+                job["data"].update(data)
+
 def process_next_in_queue():
     with queue_lock:
         for i, job in enumerate(processing_queue):
@@ -86,8 +119,9 @@ def check_storage():
         disk_usage = psutil.disk_usage(os.path.dirname(TEMP_DIR))
         used_percentage = disk_usage.percent
         
-        # Get queue length
-        queue_length = len(processing_queue)
+        # Get queue length (jobs waiting to start, running requests aren't counted)
+        with queue_lock:
+            queue_length = sum(1 for job in processing_queue if job["status"] == "queued")
         
         return jsonify({
             "total_space_gb": disk_usage.total / (1024 * 1024 * 1024),
@@ -108,6 +142,214 @@ def check_storage():
         })
 
 # --- Helper Functions ---
+def get_whisper_model(model_size):
+    with whisper_models_lock:
+        if model_size in whisper_models:
+            return whisper_models[model_size]
+        load_lock = whisper_model_load_locks.setdefault(model_size, threading.Lock())
+
+    # Load outside the shared lock so transcriptions on already loaded models
+    # aren't blocked; the per-size lock stops the same model loading twice
+    with load_lock:
+        with whisper_models_lock:
+            if model_size in whisper_models:
+                return whisper_models[model_size]
+        print(f"Loading Whisper {model_size} model...")
+        model = whisper.load_model(model_size)
+        with whisper_models_lock:
+            whisper_models[model_size] = model
+        return model
+
+# Pick a quality tier from the current load and register the job in the queue.
+# A job that is already queued (e.g. a batch item) passes its job_id and is updated instead.
+def start_job(job_type, estimated_duration, job_id=None):
+    queue_depth, inflight_cost = get_queue_load(exclude_job_id=job_id)
+    tier_name = select_tier(queue_depth, inflight_cost, estimated_duration)
+    print(f"Selected '{tier_name}' tier (queue depth {queue_depth}, in-flight cost {inflight_cost:.0f}s, estimated duration {estimated_duration:.0f}s)")
+
+    if job_id:
+        update_queue_job(job_id, "processing", cost=estimated_duration, tier=tier_name)
+    else:
+        job_id = uuid.uuid4().hex
+        add_to_queue(job_id, job_type, {"cost": estimated_duration, "tier": tier_name}, status="processing")
+    return job_id, tier_name
+
+def transcribe_audio(audio_path, job_type, job_id=None):
+    audio = whisper.load_audio(audio_path)
+    estimated_duration = len(audio) / whisper.audio.SAMPLE_RATE
+    owns_job = job_id is None
+    job_id, tier_name = start_job(job_type, estimated_duration, job_id)
+    try:
+        tier = QUALITY_TIERS[tier_name]
+        model = get_whisper_model(tier["whisper_model"])
+        result = model.transcribe(audio, **tier["decode_options"])
+        return result.get("text", ""), tier_name
+    finally:
+        if owns_job:
+            remove_from_queue(job_id)
+
+def extractive_summary(text, is_long_content=False):
+    # Fix the regex pattern to be Python-compatible
+    sentences = re.split(r'[.!?]\s+', text)
+    
+    # For long content, extract more sentences
+    numSentences = min(len(sentences), 30 if is_long_content else 20)
+    
+    # Take some sentences from beginning, middle and end for better coverage
+    extracted_sentences = []
+    # Beginning (40%)
+    beginning_count = numSentences * 4 // 10
+    extracted_sentences.extend(sentences[:beginning_count])
+    
+    # Middle (30%)
+    if len(sentences) > 30:
+        middle_start = len(sentences) // 2 - (numSentences * 15 // 100)
+        middle_count = numSentences * 3 // 10
+        extracted_sentences.extend(sentences[middle_start:middle_start + middle_count])
+    
+    # End (30%)
+    if len(sentences) > 20:
+        extracted_sentences.extend(sentences[-1 * (numSentences * 3 // 10):])
+    
+    return ' '.join(extracted_sentences)
+
+# Summarize text with BART, skipping repeated content, returns (summaries, dedup stats)
+def summarize_chunks(text, tier):
+    summarized_chunks = []
+
+    # Drop segments that repeat earlier text (intros, sponsor reads, recaps) wherever they start
+    total_chunks = len(chunk_text(text, max_tokens=250))
+    text, words_removed, segments_removed = remove_repeated_segments(text)
+
+    # ✅ Adjust chunking for BART model compatibility
+    chunks = chunk_text(text, max_tokens=250)  # Maintained at 250 tokens per chunk
+    print(f"Split text into {len(chunks)} chunks for processing ({segments_removed} repeated segments, {words_removed} words removed)")
+
+    # Then group near-duplicate chunks so only the first chunk of each group is sent to BART
+    groups = group_near_duplicates(chunks)
+    dedup_stats = get_dedup_stats(groups, total_chunks, words_removed, segments_removed)
+    print(f"Near-duplicate check: {dedup_stats['skipped_chunks']}/{dedup_stats['total_chunks']} chunks skipped (skip rate {dedup_stats['skip_rate']:.1%})")
+
+    for i, chunk in enumerate(chunks):
+        chunk_len = len(chunk.split())
+        print(f"Processing chunk {i + 1}/{len(chunks)}: {chunk_len} words")
+
+        # Skip empty chunks
+        if chunk_len < 10:
+            print(f"Skipping chunk {i + 1} (too short)")
+            continue
+
+        # Skip chunks that repeat an earlier chunk
+        if groups[i] != i:
+            print(f"Skipping chunk {i + 1} (near-duplicate of chunk {groups[i] + 1})")
+            continue
+
+        # ✅ Use more appropriate min/max length settings for better summaries
+        min_length = max(30, min(tier["summary_min_cap"], chunk_len // 4))  # Slightly increased minimum length
+        max_length = max(min_length + 50, min(tier["summary_max_cap"], chunk_len // 2))  # More generous maximum length
+
+        try:
+            print(f"Summarizing chunk {i + 1}/{len(chunks)} (min={min_length}, max={max_length})...")
+            # Set shorter timeout for each chunk summarization
+            summary = summarizer(
+                chunk,
+                max_length=max_length,
+                min_length=min_length,
+                do_sample=False,
+                truncation=True  # Ensure truncation is explicitly enabled
+            )
+            summarized_text = summary[0]["summary_text"].strip()
+            print(f"Chunk {i + 1} summary length: {len(summarized_text)} chars")
+            
+            # Only add non-empty summaries
+            if summarized_text:
+                summarized_chunks.append(summarized_text)
+                
+        except Exception as e:
+            print(f"Error summarizing chunk {i + 1}: {e}")
+            # Instead of adding error message, add a shortened version of the original text
+            # This helps ensure we always provide content even if summarization fails
+            if chunk_len > 100:
+                # Take first 2 sentences if summarization fails
+                sentences = re.split(r'[.!?]+', chunk)
+                shortened = '. '.join(sentences[:2]) + '.'
+                summarized_chunks.append(shortened)
+            else:
+                # If the chunk is already short, just use it directly
+                summarized_chunks.append(chunk)
+
+    return summarized_chunks, dedup_stats
+
+# Summarize text with the tier picked for the current load, returns (response dict, status code).
+# Pass job_id when the caller already registered the job in the queue.
+def generate_summary(text, is_long_content=False, job_id=None):
+    print(f"Input text length: {len(text)} characters")
+    
+    # Increase max length from 15K to 25K characters
+    max_length = 25000  # Increased from 15K to 25K
+    
+    if len(text) > max_length:
+        print(f"Text too long ({len(text)} chars), truncating to {max_length} characters")
+        text = text[:max_length] + "..."
+
+    owns_job = job_id is None
+    job_id, tier_name = start_job("summary", estimate_duration_from_text(text), job_id)
+    tier = QUALITY_TIERS[tier_name]
+
+    try:
+        # Under heavy load, skip BART and go straight to the extractive summary
+        if tier["summary_mode"] == "extractive":
+            print("Using extractive summary for the current load tier")
+            note = "(Note: This is an extractive summary generated to keep response times low while the server is busy.)"
+            return {
+                "summary": f"{extractive_summary(text, is_long_content).strip()}\n\n{note}",
+                "is_fallback": True,
+                "tier": tier_name
+            }, 200
+
+        summarized_chunks, dedup_stats = summarize_chunks(text, tier)
+
+        # If we didn't get any summaries, return a helpful error
+        if not summarized_chunks:
+            print("No summary chunks were generated successfully")
+            return {"error": "Failed to generate summary"}, 500
+
+        final_summary = "\n\n".join(summarized_chunks).strip()
+        print(f"Final summary generated: {len(final_summary)} characters")
+
+        # Use a more informative note for long content
+        if is_long_content:
+            final_summary += "\n\n(Note: This summary represents content from selected portions as the original was too long to process in full.)"
+        elif len(text) > max_length:
+            final_summary += "\n\n(Note: The original text was truncated before summarization due to length constraints.)"
+
+        return {"summary": final_summary, "dedup": dedup_stats, "tier": tier_name}, 200
+        
+    except Exception as e:
+        print(f"Global error in summary generation: {e}")
+        
+        # Fallback to extractive summary when BART fails
+        try:
+            print("Attempting extractive summary fallback...")
+            fallback_summary = extractive_summary(text, is_long_content)
+            
+            if is_long_content:
+                note = "(Note: This is an extractive summary generated from key portions of your content, as the full content was too long to process completely.)"
+            else:
+                note = "(Note: This is an extractive summary generated due to processing limitations with the original content.)"
+                
+            return {
+                "summary": f"{fallback_summary.strip()}\n\n{note}",
+                "is_fallback": True,
+                "tier": tier_name
+            }, 200
+        except Exception as fallback_error:
+            print(f"Even fallback summary failed: {fallback_error}")
+            return {"error": f"Failed to generate summary: {str(e)}"}, 500
+    finally:
+        if owns_job:
+            remove_from_queue(job_id)
+
 def chunk_text(text, max_tokens=500):
     words = text.split()
     chunks = []
@@ -117,6 +359,83 @@ def chunk_text(text, max_tokens=500):
         words = words[max_tokens:]
     return chunks
 
+# Extract a video's metadata once so the download helpers can reuse it
+def extract_video_info(video_url):
+    with youtube_dl.YoutubeDL({"skip_download": True, "quiet": True}) as ydl:
+        return ydl.extract_info(video_url, download=False)
+
+# Download from an already extracted info dict when there is one, instead of extracting it again
+def run_download(ydl, video_url, info=None):
+    if info:
+        # process_ie_result fills in the dict, so give each download its own copy
+        ydl.process_ie_result(copy.deepcopy(info), download=True)
+    else:
+        ydl.download([video_url])
+
+# Helper function to download YouTube subtitles, returns the VTT content or None
+def download_subtitles(video_url, info=None):
+    # Generate unique filename to avoid conflicts
+    unique_id = uuid.uuid4().hex
+    subtitle_base = os.path.join(TEMP_DIR, f"subtitle_{unique_id}")
+
+    ydl_opts = {
+        "skip_download": True,
+        "writesubtitles": True,
+        "subtitleslangs": ["en", "en-US", "en.*"],
+        "outtmpl": subtitle_base
+    }
+
+    with youtube_dl.YoutubeDL(ydl_opts) as ydl:
+        run_download(ydl, video_url, info)
+
+    # Look for any subtitle files with the unique base name
+    subtitle_files = [f for f in os.listdir(TEMP_DIR) if f.startswith(os.path.basename(subtitle_base)) and f.endswith(".vtt")]
+    if not subtitle_files:
+        return None
+
+    subtitle_file = os.path.join(TEMP_DIR, subtitle_files[0])
+    with open(subtitle_file, "r", encoding="utf-8") as f:
+        subtitles = f.read()
+
+    # Clean up temp files after reading content
+    cleanup_files([os.path.join(TEMP_DIR, f) for f in subtitle_files])
+    return subtitles
+
+# Helper function to download the audio track as mp3, returns the file path or None
+def download_audio(video_url, info=None):
+    # Create unique filenames
+    base_filename = uuid.uuid4().hex
+    audio_path = os.path.join(TEMP_DIR, f"{base_filename}.mp3")
+
+    print("Downloading audio for transcription...")
+    ydl_opts = {
+        "format": "bestaudio/best",
+        "outtmpl": audio_path,
+        "postprocessors": [
+            {
+                "key": "FFmpegExtractAudio",
+                "preferredcodec": "mp3",
+                "preferredquality": "192",
+            }
+        ],
+        # Don't add additional extension
+        "nopostoverwrites": True,
+    }
+
+    with youtube_dl.YoutubeDL(ydl_opts) as ydl:
+        run_download(ydl, video_url, info)
+
+    print(f"Audio saved: {audio_path}")
+
+    # Check if file exists before transcribing
+    if not os.path.exists(audio_path):
+        mp3_path = f"{audio_path}.mp3"  # Check with additional .mp3 extension
+        if os.path.exists(mp3_path):
+            return mp3_path
+        print(f"Audio file not found at: {audio_path} or {mp3_path}")
+        return None
+    return audio_path
+
 # Helper function to clean up temporary files
 def cleanup_files(files_list):
     for file_path in files_list:
@@ -192,32 +511,10 @@ def get_subtitle():
     video_url = data["video_url"]
     print("Processing video:", video_url)
     
-    # Generate unique filename to avoid conflicts
-    unique_id = uuid.uuid4().hex
-    subtitle_base = os.path.join(TEMP_DIR, f"subtitle_{unique_id}")
-    
     try:
-        ydl_opts = {
-            "skip_download": True,
-            "writesubtitles": True,
-            "subtitleslangs": ["en", "en-US", "en.*"],
-            "outtmpl": subtitle_base
-        }
-
-        with youtube_dl.YoutubeDL(ydl_opts) as ydl:
-            ydl.download([video_url])
-        
-        # Look for any subtitle files with the unique base name
-        subtitle_files = [f for f in os.listdir(TEMP_DIR) if f.startswith(os.path.basename(subtitle_base)) and f.endswith(".vtt")]
+        subtitles = download_subtitles(video_url)
         
-        if subtitle_files:
-            subtitle_file = os.path.join(TEMP_DIR, subtitle_files[0])
-            with open(subtitle_file, "r", encoding="utf-8") as f:
-                subtitles = f.read()
-            
-            # Clean up temp files after reading content
-            cleanup_files([os.path.join(TEMP_DIR, f) for f in subtitle_files])
-            
+        if subtitles:
             print("Subtitles fetched successfully!")
             return jsonify({"subtitles": subtitles})
         else:
@@ -247,8 +544,7 @@ def get_transcription():
 
         # Add error handling around the transcription process
         try:
-            result = whisper_model.transcribe(audio_path)
-            transcription = result.get("text", "")
+            transcription, tier_name = transcribe_audio(audio_path, "transcription")
             print("Transcription completed!")
         except Exception as transcription_error:
             print(f"Error during transcription process: {transcription_error}")
@@ -262,7 +558,7 @@ def get_transcription():
         os.remove(audio_path)
         print("Temp file deleted!")
 
-        return jsonify({"transcription": transcription})
+        return jsonify({"transcription": transcription, "tier": tier_name})
 
     except Exception as e:
         print(f"General error during transcription: {e}")
@@ -283,44 +579,14 @@ def get_transcription_from_url():
 
         print(f"Downloading from: {video_url}")
 
-        # Create unique filenames
-        base_filename = uuid.uuid4().hex
-        audio_path = os.path.join(TEMP_DIR, f"{base_filename}.mp3")
-
         # Download audio and transcribe
-        print("Downloading audio for transcription...")
-        ydl_opts = {
-            "format": "bestaudio/best",
-            "outtmpl": audio_path,
-            "postprocessors": [
-                {
-                    "key": "FFmpegExtractAudio",
-                    "preferredcodec": "mp3",
-                    "preferredquality": "192",
-                }
-            ],
-            # Don't add additional extension
-            "nopostoverwrites": True,
-        }
-
-        with youtube_dl.YoutubeDL(ydl_opts) as ydl:
-            ydl.download([video_url])
-
-        print(f"Audio saved: {audio_path}")
-
-        # Check if file exists before transcribing
-        if not os.path.exists(audio_path):
-            mp3_path = f"{audio_path}.mp3"  # Check with additional .mp3 extension
-            if os.path.exists(mp3_path):
-                audio_path = mp3_path
-            else:
-                print(f"Audio file not found at: {audio_path} or {mp3_path}")
-                return jsonify({"error": "Failed to download audio"}), 500
+        audio_path = download_audio(video_url)
+        if not audio_path:
+            return jsonify({"error": "Failed to download audio"}), 500
 
         # Transcribe the audio file
         try:
-            result = whisper_model.transcribe(audio_path)
-            transcription = result.get("text", "")
+            transcription, tier_name = transcribe_audio(audio_path, "transcription_from_url")
             print("Transcription completed!")
         except Exception as transcription_error:
             print(f"Error during transcription process: {transcription_error}")
@@ -334,7 +600,7 @@ def get_transcription_from_url():
             os.remove(audio_path)
             print("Temporary audio file cleaned up")
 
-        return jsonify({"transcription": transcription})
+        return jsonify({"transcription": transcription, "tier": tier_name})
 
     except Exception as e:
         print(f"General error during transcription from URL: {e}")
@@ -357,135 +623,8 @@ def get_summary():
     if not data or not data.get("text") or not data["text"].strip():
         return jsonify({"error": "No text provided"}), 400
 
-    text = data["text"].strip()
-    print(f"Input text length: {len(text)} characters")
-    
-    # Increase max length from 15K to 25K characters
-    max_length = 25000  # Increased from 15K to 25K
-    
-    # Check if this is a long content request
-    is_long_content = data.get("is_long_content", False)
-    
-    if len(text) > max_length:
-        print(f"Text too long ({len(text)} chars), truncating to {max_length} characters")
-        text = text[:max_length] + "..."
-
-    # ✅ Adjust chunking for BART model compatibility
-    def chunk_text(text, max_tokens=250):  # Maintained at 250 tokens per chunk
-        words = text.split()
-        chunks = []
-        while words:
-            chunk = words[:max_tokens]
-            chunks.append(" ".join(chunk))
-            words = words[max_tokens:]
-        return chunks
-
-    try:
-        chunks = chunk_text(text)
-        print(f"Split text into {len(chunks)} chunks for processing")
-        summarized_chunks = []
-
-        for i, chunk in enumerate(chunks):
-            chunk_len = len(chunk.split())
-            print(f"Processing chunk {i + 1}/{len(chunks)}: {chunk_len} words")
-
-            # Skip empty chunks
-            if chunk_len < 10:
-                print(f"Skipping chunk {i + 1} (too short)")
-                continue
-
-            # ✅ Use more appropriate min/max length settings for better summaries
-            min_length = max(30, min(80, chunk_len // 4))  # Slightly increased minimum length
-            max_length = max(min_length + 50, min(200, chunk_len // 2))  # More generous maximum length
-
-            try:
-                print(f"Summarizing chunk {i + 1}/{len(chunks)} (min={min_length}, max={max_length})...")
-                # Set shorter timeout for each chunk summarization
-                summary = summarizer(
-                    chunk,
-                    max_length=max_length,
-                    min_length=min_length,
-                    do_sample=False,
-                    truncation=True  # Ensure truncation is explicitly enabled
-                )
-                summarized_text = summary[0]["summary_text"].strip()
-                print(f"Chunk {i + 1} summary length: {len(summarized_text)} chars")
-                
-                # Only add non-empty summaries
-                if summarized_text:
-                    summarized_chunks.append(summarized_text)
-                    
-            except Exception as e:
-                print(f"Error summarizing chunk {i + 1}: {e}")
-                # Instead of adding error message, add a shortened version of the original text
-                # This helps ensure we always provide content even if summarization fails
-                if chunk_len > 100:
-                    # Take first 2 sentences if summarization fails
-                    sentences = re.split(r'[.!?]+', chunk)
-                    shortened = '. '.join(sentences[:2]) + '.'
-                    summarized_chunks.append(shortened)
-                else:
-                    # If the chunk is already short, just use it directly
-                    summarized_chunks.append(chunk)
-        
-        # If we didn't get any summaries, return a helpful error
-        if not summarized_chunks:
-            print("No summary chunks were generated successfully")
-            return jsonify({"error": "Failed to generate summary"}), 500
-
-        final_summary = "\n\n".join(summarized_chunks).strip()
-        print(f"Final summary generated: {len(final_summary)} characters")
-
-        # Use a more informative note for long content
-        if is_long_content:
-            final_summary += "\n\n(Note: This summary represents content from selected portions as the original was too long to process in full.)"
-        elif len(text) > max_length:
-            final_summary += "\n\n(Note: The original text was truncated before summarization due to length constraints.)"
-
-        return jsonify({"summary": final_summary})
-        
-    except Exception as e:
-        print(f"Global error in summary generation: {e}")
-        
-        # Fallback to extractive summary when BART fails
-        try:
-            print("Attempting extractive summary fallback...")
-            # Fix the regex pattern to be Python-compatible
-            sentences = re.split(r'[.!?]\s+', text)
-            
-            # For long content, extract more sentences
-            numSentences = min(len(sentences), 30 if is_long_content else 20)
-            
-            # Take some sentences from beginning, middle and end for better coverage
-            extracted_sentences = []
-            # Beginning (40%)
-            beginning_count = numSentences * 4 // 10
-            extracted_sentences.extend(sentences[:beginning_count])
-            
-            # Middle (30%)
-            if len(sentences) > 30:
-                middle_start = len(sentences) // 2 - (numSentences * 15 // 100)
-                middle_count = numSentences * 3 // 10
-                extracted_sentences.extend(sentences[middle_start:middle_start + middle_count])
-            
-            # End (30%)
-            if len(sentences) > 20:
-                extracted_sentences.extend(sentences[-1 * (numSentences * 3 // 10):])
-            
-            extractive_summary = ' '.join(extracted_sentences)
-            
-            if is_long_content:
-                note = "(Note: This is an extractive summary generated from key portions of your content, as the full content was too long to process completely.)"
-            else:
-                note = "(Note: This is an extractive summary generated due to processing limitations with the original content.)"
-                
-            return jsonify({
-                "summary": f"{extractive_summary.strip()}\n\n{note}",
-                "is_fallback": True
-            })
-        except Exception as fallback_error:
-            print(f"Even fallback summary failed: {fallback_error}")
-            return jsonify({"error": f"Failed to generate summary: {str(e)}"}), 500
+    result, status = generate_summary(data["text"].strip(), data.get("is_long_content", False))
+    return jsonify(result), status
 
 # 5️⃣ GET TRANSLATION FUNCTION 
 @app.route("/translate", methods=["POST"])
@@ -628,6 +767,190 @@ def translate_text():
         traceback.print_exc()  # Print full stack trace for debugging
         return jsonify({"error": f"Translation error: {str(e)}"}), 500
 
+# --- Batch Helper Functions ---
+def is_string_list(value):
+    return isinstance(value, list) and all(isinstance(item, str) for item in value)
+
+# Expand a playlist URL once into its items (no media is downloaded here)
+def expand_playlist(playlist_url):
+    ydl_opts = {
+        "extract_flat": "in_playlist",
+        "skip_download": True,
+        "quiet": True,
+        # One past the limit is enough to reject oversized playlists without listing every entry
+        "playlistend": BATCH_MAX_ITEMS + 1,
+    }
+    with youtube_dl.YoutubeDL(ydl_opts) as ydl:
+        info = ydl.extract_info(playlist_url, download=False)
+
+    # A single video URL has no entries, treat it as a playlist of one.
+    # An empty playlist stays empty so the request gets "No videos found".
+    if info.get("_type") == "playlist" or "entries" in info:
+        entries = info.get("entries") or []
+    else:
+        entries = [info]
+    items = []
+    for entry in entries:
+        if not entry:
+            continue
+        url = entry.get("webpage_url") or entry.get("url")
+        if not url:
+            continue
+        items.append({
+            "url": url,
+            "title": entry.get("title"),
+            "duration": entry.get("duration"),
+        })
+    return items
+
+# Run one batch item through the pipeline, reporting progress on the events queue.
+# The item is already registered in the processing queue under job_id, so each stage
+# picks its tier with the rest of the batch counted as load.
+# Errors are reported as an "item_failed" event so the rest of the batch keeps going.
+def process_batch_item(index, item, tasks, events, job_id):
+    video_url = item["url"]
+    result = {"url": video_url, "title": item.get("title")}
+    audio_path = None
+
+    def progress(stage):
+        events.put({"event": "item_progress", "index": index, "url": video_url, "stage": stage})
+
+    try:
+        events.put({"event": "item_started", "index": index, "url": video_url, "title": item.get("title")})
+        update_queue_job(job_id, "processing")
+
+        # Extract the metadata once and reuse it for the subtitle and audio downloads
+        progress("metadata")
+        info = extract_video_info(video_url)
+        result["title"] = result["title"] or info.get("title")
+        result["duration"] = item.get("duration") or info.get("duration")
+
+        text = None
+        summary_only = "summary" in tasks and "transcription" not in tasks
+
+        # A summary without a transcription task uses the subtitles when there are any
+        if "subtitle" in tasks or summary_only:
+            progress("subtitle")
+            subtitles = download_subtitles(video_url, info)
+            if "subtitle" in tasks:
+                result["subtitles"] = subtitles
+            if subtitles:
+                text = clean_subtitle_text(subtitles)
+                result["summary_source"] = "subtitles"
+
+        # ...and falls back to transcribing the audio when there are none
+        if "transcription" in tasks or ("summary" in tasks and not text):
+            progress("downloading_audio")
+            audio_path = download_audio(video_url, info)
+            if not audio_path:
+                raise Exception("Failed to download audio")
+
+            progress("transcription")
+            transcription, tier_name = transcribe_audio(audio_path, "batch_transcription", job_id)
+            if "transcription" in tasks:
+                result["transcription"] = transcription
+                result["transcription_tier"] = tier_name
+            text = transcription
+            result["summary_source"] = "transcription"
+
+        if "summary" in tasks:
+            if not text or not text.strip():
+                raise Exception("No subtitles or speech found to summarize")
+            progress("summary")
+            summary, status = generate_summary(text.strip(), job_id=job_id)
+            if status != 200:
+                raise Exception(summary.get("error", "Failed to generate summary"))
+            result["summary"] = summary
+        else:
+            result.pop("summary_source", None)
+
+        events.put({"event": "item_completed", "index": index, "url": video_url, "result": result})
+    except Exception as e:
+        print(f"Error processing batch item {index + 1} ({video_url}): {e}")
+        print(f"Stack trace: {traceback.format_exc()}")
+        events.put({"event": "item_failed", "index": index, "url": video_url, "error": str(e)})
+    finally:
+        remove_from_queue(job_id)
+        if audio_path:
+            cleanup_files([audio_path])
+
+# 6️⃣ BATCH / PLAYLIST PROCESSING (Streams newline-delimited JSON progress events)
+@app.route("/process_batch", methods=["POST"])
+def process_batch():
+    print("Received batch processing request...")
+
+    data = request.get_json(silent=True)
+    if not data or (not data.get("urls") and not data.get("playlist_url")):
+        return jsonify({"error": "Provide a list of urls or a playlist_url"}), 400
+
+    urls = data.get("urls") or []
+    tasks = data.get("tasks") or ["transcription", "summary"]
+    playlist_url = data.get("playlist_url")
+    if not is_string_list(urls):
+        return jsonify({"error": "urls must be a list of strings"}), 400
+    if not is_string_list(tasks):
+        return jsonify({"error": "tasks must be a list of strings"}), 400
+    if playlist_url is not None and not isinstance(playlist_url, str):
+        return jsonify({"error": "playlist_url must be a string"}), 400
+
+    invalid_tasks = [task for task in tasks if task not in BATCH_TASKS]
+    if invalid_tasks:
+        return jsonify({"error": f"Unknown tasks: {', '.join(invalid_tasks)}"}), 400
+    if len(urls) > BATCH_MAX_ITEMS:
+        return jsonify({"error": f"Too many items ({len(urls)}), the limit is {BATCH_MAX_ITEMS} per batch"}), 400
+
+    try:
+        items = [{"url": url} for url in urls]
+        if playlist_url:
+            print(f"Expanding playlist: {playlist_url}")
+            items.extend(expand_playlist(playlist_url))
+    except Exception as e:
+        print(f"Error expanding playlist: {e}")
+        return jsonify({"error": f"Failed to expand playlist: {str(e)}"}), 500
+
+    if not items:
+        return jsonify({"error": "No videos found to process"}), 400
+    if len(items) > BATCH_MAX_ITEMS:
+        return jsonify({"error": f"Too many items (more than {BATCH_MAX_ITEMS}), the limit is {BATCH_MAX_ITEMS} per batch"}), 400
+
+    print(f"Processing batch of {len(items)} items with tasks {tasks}")
+
+    def generate():
+        events = queue.Queue()
+        succeeded = 0
+        failed = 0
+
+        yield json.dumps({"event": "batch_started", "total": len(items), "tasks": tasks}) + "\n"
+
+        # Register every item up front so /check_storage shows the backlog (queued
+        # items don't count as load for the tier policy until they start running),
+        # then share the server-wide worker pool with other batches
+        batch_id = uuid.uuid4().hex
+        futures = []
+        for i, item in enumerate(items):
+            job_id = uuid.uuid4().hex
+            add_to_queue(job_id, "batch_item", {"cost": item.get("duration") or 0, "batch_id": batch_id})
+            futures.append((job_id, batch_executor.submit(process_batch_item, i, item, tasks, events, job_id)))
+
+        try:
+            while succeeded + failed < len(items):
+                event = events.get()
+                if event["event"] == "item_completed":
+                    succeeded += 1
+                elif event["event"] == "item_failed":
+                    failed += 1
+                yield json.dumps(event) + "\n"
+        finally:
+            # Client disconnected or batch finished, drop any items that haven't started
+            for job_id, future in futures:
+                if future.cancel():
+                    remove_from_queue(job_id)
+
+        print(f"Batch finished: {succeeded} succeeded, {failed} failed")
+        yield json.dumps({"event": "batch_completed", "total": len(items), "succeeded": succeeded, "failed": failed}) + "\n"
+
+    return Response(generate(), mimetype="application/x-ndjson")
+
 # Run Flask app
 if __name__ == "__main__":
     app.run(debug=True, port=5000)
@@ -0,0 +1,112 @@
+import re
+import zlib
+
+import numpy as np
+
+# Mersenne prime used for the universal hash family (a * x + b) mod p
+MERSENNE_PRIME = (1 << 61) - 1
+MAX_HASH = (1 << 32) - 1
+
+
+def get_shingles(text, shingle_size=3):
+    # Word-level shingles, lowercased and stripped of punctuation so that
+    # small transcription differences don't break the match
+    words = re.findall(r"\w+", text.lower())
+    if len(words) < shingle_size:
+        return {" ".join(words)} if words else set()
+    return {" ".join(words[i:i + shingle_size]) for i in range(len(words) - shingle_size + 1)}
+
+
+def build_minhash_signatures(chunks, num_perm=128, shingle_size=3, seed=42):
+    # Returns an (len(chunks), num_perm) array of MinHash signatures.
+    # Permutations are generated from a fixed seed so signatures are stable
+    # across requests and worker processes.
+    rng = np.random.RandomState(seed)
+    a = rng.randint(1, MAX_HASH, size=num_perm, dtype=np.uint64)
+    b = rng.randint(0, MAX_HASH, size=num_perm, dtype=np.uint64)
+
+    signatures = np.full((len(chunks), num_perm), MAX_HASH, dtype=np.uint64)
+    for i, chunk in enumerate(chunks):
+        shingles = get_shingles(chunk, shingle_size)
+        if not shingles:
+            continue
+        hashes = np.array([zlib.crc32(s.encode("utf-8")) for s in shingles], dtype=np.uint64)
+        # Apply all permutations to all shingles at once, then take the column minimum
+        permuted = (np.outer(hashes, a) + b) % MERSENNE_PRIME & MAX_HASH
+        signatures[i] = permuted.min(axis=0)
+    return signatures
+
+
+def group_near_duplicates(chunks, threshold=0.8, num_perm=128, shingle_size=3):
+    # Assigns every chunk to a group. Each group is represented by its
+    # earliest chunk, so iterating the representatives keeps the original order.
+    # Returns a list where groups[i] is the index of the representative for chunk i.
+    if not chunks:
+        return []
+
+    signatures = build_minhash_signatures(chunks, num_perm=num_perm, shingle_size=shingle_size)
+    groups = list(range(len(chunks)))
+    representatives = []
+
+    for i in range(len(chunks)):
+        if representatives:
+            # Estimated Jaccard similarity against every representative so far
+            similarity = (signatures[representatives] == signatures[i]).mean(axis=1)
+            best = int(similarity.argmax())
+            if similarity[best] >= threshold:
+                groups[i] = representatives[best]
+                continue
+        representatives.append(i)
+
+    return groups
+
+
+def remove_repeated_segments(text, window_size=8, min_segment_words=40):
+    # Drops spans of at least min_segment_words that repeat earlier text, wherever
+    # they start, so repeats don't need to line up with chunk boundaries.
+    # Each word window is hashed and compared with every earlier window; the first
+    # occurrence of a segment is kept. Returns (text, words removed, segments removed).
+    words = text.split()
+    normalized = [re.sub(r"\W+", "", word.lower()) for word in words]
+    if len(words) < max(window_size, min_segment_words):
+        return text, 0, 0
+
+    repeated = np.zeros(len(words), dtype=bool)
+    first_seen = {}
+    for i in range(len(words) - window_size + 1):
+        window_hash = zlib.crc32(" ".join(normalized[i:i + window_size]).encode("utf-8"))
+        first = first_seen.setdefault(window_hash, i)
+        # Only count matches that don't overlap the earlier window
+        if first + window_size <= i:
+            repeated[i:i + window_size] = True
+
+    # Find the runs of repeated words and keep only the long ones
+    edges = np.diff(np.concatenate(([0], repeated.astype(np.int8), [0])))
+    starts = np.flatnonzero(edges == 1)
+    ends = np.flatnonzero(edges == -1)
+    long_runs = (ends - starts) >= min_segment_words
+    if not long_runs.any():
+        return text, 0, 0
+
+    keep = np.ones(len(words), dtype=bool)
+    for start, end in zip(starts[long_runs], ends[long_runs]):
+        keep[start:end] = False
+
+    kept_words = [word for word, kept in zip(words, keep) if kept]
+    return " ".join(kept_words), int((~keep).sum()), int(long_runs.sum())
+
+
+def get_dedup_stats(groups, total_chunks=None, words_removed=0, segments_removed=0):
+    # total_chunks is the chunk count before repeated segments were removed,
+    # so the skip rate covers both kinds of savings
+    total = len(groups) if total_chunks is None else max(total_chunks, len(groups))
+    unique = len(set(groups))
+    skipped = total - unique
+    return {
+        "total_chunks": total,
+        "unique_chunks": unique,
+        "skipped_chunks": skipped,
+        "skip_rate": round(skipped / total, 3) if total else 0.0,
+        "repeated_segments_removed": segments_removed,
+        "repeated_words_removed": words_removed,
+    }
@@ -0,0 +1,87 @@
+import os
+
+# Average speaking rate, used to turn a text length into an equivalent audio duration
+WORDS_PER_MINUTE = 150
+
+# Quality tiers, from most to least expensive.
+# "standard" matches the original fixed settings (Whisper base + BART) and is
+# the default when the server isn't busy. "high" is opt-in through TIER_HIGH_*.
+QUALITY_TIERS = {
+    "high": {
+        "whisper_model": "small",
+        "decode_options": {"beam_size": 5, "best_of": 5},
+        "summary_mode": "abstractive",
+        "summary_min_cap": 80,
+        "summary_max_cap": 200,
+    },
+    "standard": {
+        "whisper_model": "base",
+        "decode_options": {},
+        "summary_mode": "abstractive",
+        "summary_min_cap": 80,
+        "summary_max_cap": 200,
+    },
+    "fast": {
+        "whisper_model": "tiny",
+        # Greedy decoding only, no temperature fallback retries
+        "decode_options": {"temperature": 0.0, "condition_on_previous_text": False},
+        # Summary length caps aren't needed, the extractive summary skips BART
+        "summary_mode": "extractive",
+    },
+}
+
+
+def _env_float(name, default):
+    try:
+        return float(os.environ.get(name, default))
+    except ValueError:
+        print(f"Invalid value for {name}, using default {default}")
+        return float(default)
+
+
+# Thresholds can be tuned per deployment through environment variables.
+# Costs and durations are in seconds of audio.
+TIER_THRESHOLDS = {
+    # Use the high tier only when at most this many jobs are waiting
+    # (-1 disables the high tier, which is the default)...
+    "high_max_queue_depth": _env_float("TIER_HIGH_MAX_QUEUE_DEPTH", -1),
+    # ...and the request itself is short enough
+    "high_max_duration": _env_float("TIER_HIGH_MAX_DURATION", 600),
+    # Drop to the fast tier once this many jobs are waiting...
+    "fast_min_queue_depth": _env_float("TIER_FAST_MIN_QUEUE_DEPTH", 4),
+    # ...or once in-flight work plus this request passes this cost
+    # (only while other work is running, a long request on an idle server isn't downgraded)
+    "fast_min_inflight_cost": _env_float("TIER_FAST_MIN_INFLIGHT_COST", 3600),
+}
+
+
+def estimate_duration_from_text(text):
+    return len(text.split()) / WORDS_PER_MINUTE * 60
+
+
+def measure_load(jobs, exclude_job_id=None):
+    # Only running jobs use compute. Queued jobs (e.g. batch items waiting for a
+    # worker) don't slow anyone down, so they aren't counted as load.
+    # Items of the same batch as the excluded job aren't counted either, the
+    # batch's own concurrency is already capped by its worker pool.
+    batch_id = next((job["data"].get("batch_id") for job in jobs if job["id"] == exclude_job_id), None)
+    running = [
+        job for job in jobs
+        if job["status"] == "processing"
+        and job["id"] != exclude_job_id
+        and (batch_id is None or job["data"].get("batch_id") != batch_id)
+    ]
+    return len(running), sum(job["data"].get("cost", 0) for job in running)
+
+
+def select_tier(queue_depth, inflight_cost, estimated_duration, thresholds=TIER_THRESHOLDS):
+    # queue_depth and inflight_cost describe the other jobs, not this request.
+    # The request's own duration only adds weight to load that already exists.
+    busy = queue_depth > 0 or inflight_cost > 0
+    if busy and (queue_depth >= thresholds["fast_min_queue_depth"]
+                 or inflight_cost + estimated_duration >= thresholds["fast_min_inflight_cost"]):
+        return "fast"
+    if (queue_depth <= thresholds["high_max_queue_depth"]
+            and estimated_duration <= thresholds["high_max_duration"]):
+        return "high"
+    return "standard"
@@ -0,0 +1,87 @@
+from chunk_dedup import group_near_duplicates, get_dedup_stats, remove_repeated_segments
+
+SPONSOR = "This episode is sponsored by Acme, who make the best widgets in the world. Use code PODCAST for ten percent off your first order at acme dot com. " * 3
+TOPIC_A = "Quantum computers use qubits that can exist in superposition, and entanglement lets them correlate in ways classical bits never could."
+TOPIC_B = "To make the sauce, warm olive oil with sliced garlic and chili flakes, then toss the pasta with a splash of cooking water."
+
+
+def test_exact_duplicates_grouped_to_earliest_chunk():
+    groups = group_near_duplicates([SPONSOR, TOPIC_A, SPONSOR, SPONSOR])
+    assert groups == [0, 1, 0, 0]
+
+
+def test_near_duplicates_grouped_to_earliest_chunk():
+    near_copy = SPONSOR.replace("ten percent", "10 percent", 1)
+    groups = group_near_duplicates([TOPIC_A, SPONSOR, TOPIC_B, near_copy])
+    assert groups == [0, 1, 2, 1]
+
+
+def test_distinct_chunks_kept():
+    assert group_near_duplicates([TOPIC_A, TOPIC_B]) == [0, 1]
+
+
+def test_empty_input():
+    assert group_near_duplicates([]) == []
+    assert get_dedup_stats([]) == {
+        "total_chunks": 0,
+        "unique_chunks": 0,
+        "skipped_chunks": 0,
+        "skip_rate": 0.0,
+        "repeated_segments_removed": 0,
+        "repeated_words_removed": 0,
+    }
+
+
+def test_dedup_stats():
+    stats = get_dedup_stats([0, 1, 0, 0])
+    assert stats["unique_chunks"] == 2
+    assert stats["skipped_chunks"] == 2
+    assert stats["skip_rate"] == 0.5
+
+
+def filler(prefix, count):
+    return " ".join(f"{prefix}{i}" for i in range(count))
+
+
+def test_repeated_segment_removed_at_any_offset():
+    segment = filler("recap", 300)
+    for offset in (0, 20, 40, 80):
+        text = " ".join([filler("intro", offset), segment, filler("body", 500), segment, filler("outro", 100)])
+        deduped, words_removed, segments_removed = remove_repeated_segments(text)
+        assert segments_removed == 1
+        assert words_removed == 300
+        # The first occurrence is kept
+        assert deduped.count("recap0 ") == 1
+        assert deduped.split()[offset:offset + 300] == segment.split()
+
+
+def test_repeated_segment_with_changed_punctuation_and_case():
+    segment = " ".join(f"Sponsor{i}," for i in range(60))
+    text = " ".join([segment, filler("body", 200), segment.lower().replace(",", "")])
+    _, words_removed, segments_removed = remove_repeated_segments(text)
+    assert segments_removed == 1
+    assert words_removed == 60
+
+
+def test_short_repeats_kept():
+    phrase = "you know what I mean right so anyway"
+    text = " ".join([filler("a", 100), phrase, filler("b", 100), phrase])
+    assert remove_repeated_segments(text) == (text, 0, 0)
+
+
+def test_word_repeated_in_place():
+    short = " ".join([filler("a", 50)] + ["no"] * 20)
+    assert remove_repeated_segments(short) == (short, 0, 0)
+
+    # Long loops (e.g. a transcription stuck on one word) are trimmed after the first window
+    deduped, words_removed, _ = remove_repeated_segments(" ".join([filler("a", 50)] + ["no"] * 100))
+    assert deduped.split().count("no") == 8
+    assert words_removed == 92
+
+
+def test_dedup_stats_count_removed_segments_as_skipped_chunks():
+    # 4 chunks before removal, 2 unique chunks after
+    stats = get_dedup_stats([0, 1], total_chunks=4, words_removed=500, segments_removed=1)
+    assert stats["skipped_chunks"] == 2
+    assert stats["skip_rate"] == 0.5
+    assert stats["repeated_words_removed"] == 500
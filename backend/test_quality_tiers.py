@@ -0,0 +1,85 @@
+from quality_tiers import TIER_THRESHOLDS, select_tier, estimate_duration_from_text, measure_load
+
+THRESHOLDS = {
+    "high_max_queue_depth": 0,
+    "high_max_duration": 600,
+    "fast_min_queue_depth": 4,
+    "fast_min_inflight_cost": 3600,
+}
+
+
+def test_high_tier_disabled_by_default():
+    assert TIER_THRESHOLDS["high_max_queue_depth"] == -1
+    assert select_tier(0, 0, 60) == "standard"
+
+
+def test_high_tier_boundaries():
+    assert select_tier(0, 0, 600, THRESHOLDS) == "high"
+    assert select_tier(0, 0, 601, THRESHOLDS) == "standard"
+    assert select_tier(1, 0, 600, THRESHOLDS) == "standard"
+
+
+def test_fast_tier_queue_depth_boundary():
+    assert select_tier(3, 0, 60, THRESHOLDS) == "standard"
+    assert select_tier(4, 0, 60, THRESHOLDS) == "fast"
+
+
+def test_fast_tier_inflight_cost_boundary():
+    assert select_tier(1, 3000, 599, THRESHOLDS) == "standard"
+    assert select_tier(1, 3000, 600, THRESHOLDS) == "fast"
+
+
+def test_long_request_on_idle_server_not_downgraded():
+    assert select_tier(0, 0, 4 * 3600, THRESHOLDS) == "standard"
+    assert select_tier(0, 0, 4 * 3600) == "standard"
+    # The same request counts towards the cost once anything else is running
+    assert select_tier(1, 1, 3599, THRESHOLDS) == "fast"
+
+
+def test_fast_tier_takes_priority_over_high():
+    assert select_tier(0, 3000, 600, {**THRESHOLDS, "high_max_duration": 7200}) == "fast"
+
+
+def test_estimate_duration_from_text():
+    assert estimate_duration_from_text(" ".join(["word"] * 150)) == 60
+    assert estimate_duration_from_text("") == 0
+
+
+def make_job(job_id, status, cost, batch_id=None):
+    data = {"cost": cost}
+    if batch_id:
+        data["batch_id"] = batch_id
+    return {"id": job_id, "type": "batch_item", "status": status, "data": data}
+
+
+def test_queued_batch_items_not_counted_as_load():
+    # A 5-item playlist of 1h lectures, nothing running yet
+    jobs = [make_job(f"item{i}", "queued", 3600, "batch1") for i in range(5)]
+    assert measure_load(jobs) == (0, 0)
+
+    # Other users aren't downgraded by the waiting items
+    assert select_tier(*measure_load(jobs), 60) == "standard"
+
+    # The first item starts on an otherwise idle server
+    jobs[0]["status"] = "processing"
+    queue_depth, inflight_cost = measure_load(jobs, exclude_job_id="item0")
+    assert select_tier(queue_depth, inflight_cost, 3600) == "standard"
+
+
+def test_running_jobs_counted_as_load():
+    jobs = [make_job(f"job{i}", "processing", 600) for i in range(4)] + [make_job("waiting", "queued", 3600)]
+    assert measure_load(jobs) == (4, 2400)
+    assert measure_load(jobs, exclude_job_id="job0") == (3, 1800)
+    assert select_tier(*measure_load(jobs), 60) == "fast"
+
+
+def test_batch_items_not_counted_against_each_other():
+    # Two workers of the same 5-item batch running on an otherwise idle server
+    jobs = [make_job(f"item{i}", "processing" if i < 2 else "queued", 3600, "batch1") for i in range(5)]
+    for job_id in ("item0", "item1"):
+        assert select_tier(*measure_load(jobs, exclude_job_id=job_id), 3600) == "standard"
+
+    # Other requests and other batches still see the running items as load
+    assert measure_load(jobs) == (2, 7200)
+    jobs.append(make_job("other", "processing", 60, "batch2"))
+    assert measure_load(jobs, exclude_job_id="other") == (2, 7200)